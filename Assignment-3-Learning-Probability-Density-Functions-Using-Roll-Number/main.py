@@ -6,6 +6,15 @@ from scipy.optimize import curve_fit
 
 ROLL_NUMBER = 102303748
 DATA_FILE = "india-air-quality-data.csv"
+COLUMN = "no2"
+BINS = 80
+
+# Streaming mode reads only COLUMN in chunks so memory stays constant
+# regardless of file size. Set HIST_RANGE to (low, high) to skip the
+# first pass that finds the range.
+STREAMING = False
+CHUNK_SIZE = 200_000
+HIST_RANGE = None
 
 
 def transform_values(values, roll):
@@ -24,10 +33,58 @@ def empirical_density(data, bins=80):
     return centers, density
 
 
-def fit_parameters(x_vals, y_vals, data):
+def read_chunks(path, column=COLUMN, chunksize=CHUNK_SIZE, roll=ROLL_NUMBER):
+    reader = pd.read_csv(
+        path,
+        usecols=[column],
+        encoding="latin1",
+        chunksize=chunksize,
+        low_memory=False
+    )
+    for chunk in reader:
+        values = pd.to_numeric(chunk[column], errors="coerce").dropna()
+        if len(values):
+            yield transform_values(values.to_numpy(dtype=np.float64), roll)
+
+
+def streaming_density(path, bins=80, hist_range=None, **kwargs):
+    # First pass only when the histogram range is not given.
+    if hist_range is None:
+        low, high = np.inf, -np.inf
+        for z in read_chunks(path, **kwargs):
+            low = min(low, z.min())
+            high = max(high, z.max())
+        if not np.isfinite(low):
+            raise ValueError(f"No numeric values found in '{path}'.")
+        hist_range = (low, high)
+
+    edges = np.linspace(hist_range[0], hist_range[1], bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    n = 0
+    total = 0.0
+    total_sq = 0.0
+
+    for z in read_chunks(path, **kwargs):
+        counts += np.histogram(z, bins=edges)[0]
+        n += len(z)
+        total += z.sum()
+        total_sq += np.square(z).sum()
+
+    if n == 0:
+        raise ValueError(f"No numeric values found in '{path}'.")
+
+    density = counts / (counts.sum() * np.diff(edges))
+    centers = 0.5 * (edges[:-1] + edges[1:])
+
+    mean = total / n
+    var = total_sq / n - mean ** 2
+    return centers, density, mean, var
+
+
+def fit_parameters(x_vals, y_vals, mean, var):
     start = [
-        1 / (2 * np.var(data)),
-        np.mean(data),
+        1 / (2 * var),
+        mean,
         np.max(y_vals)
     ]
     params, _ = curve_fit(gaussian_like, x_vals, y_vals, p0=start)
@@ -35,22 +92,31 @@ def fit_parameters(x_vals, y_vals, data):
 
 
 def main():
-    df = pd.read_csv(DATA_FILE, encoding="latin1")
-    no2_series = pd.to_numeric(df["no2"], errors="coerce").dropna()
+    if STREAMING:
+        x_emp, y_emp, mean, var = streaming_density(
+            DATA_FILE, bins=BINS, hist_range=HIST_RANGE
+        )
+    else:
+        df = pd.read_csv(DATA_FILE, encoding="latin1")
+        no2_series = pd.to_numeric(df[COLUMN], errors="coerce").dropna()
+
+        z = transform_values(no2_series.to_numpy(), ROLL_NUMBER)
 
-    z = transform_values(no2_series.to_numpy(), ROLL_NUMBER)
+        x_emp, y_emp = empirical_density(z, bins=BINS)
+        mean, var = np.mean(z), np.var(z)
 
-    x_emp, y_emp = empirical_density(z)
-    lam, mu, c = fit_parameters(x_emp, y_emp, z)
+    lam, mu, c = fit_parameters(x_emp, y_emp, mean, var)
 
     print("lambda =", lam)
     print("mu =", mu)
     print("c =", c)
 
+    width = x_emp[1] - x_emp[0]
+
     plt.figure(figsize=(8, 4))
-    plt.bar(x_emp, y_emp, width=(x_emp[1] - x_emp[0]), alpha=0.5)
+    plt.bar(x_emp, y_emp, width=width, alpha=0.5)
 
-    grid = np.linspace(z.min(), z.max(), 500)
+    grid = np.linspace(x_emp[0] - width / 2, x_emp[-1] + width / 2, 500)
     plt.plot(grid, gaussian_like(grid, lam, mu, c), color="red", linewidth=2)
 
     plt.xlabel("z")
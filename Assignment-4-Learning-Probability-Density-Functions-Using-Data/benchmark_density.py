@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from kde import binned_kde
+
+
+r = 102303748
+a_r = 0.5 * (r % 7)
+b_r = 0.3 * ((r % 5) + 1)
+
+DATA_FILE = "india-air-quality-data.csv"
+GRID_POINTS = 1_000_000
+SYNTHETIC_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+GAN_EPOCHS = 3000
+
+
+def synthesize(n):
+    # The transformed NO2 data is right-skewed; a gamma stand-in is used when
+    # the dataset is not present or a larger n is wanted.
+    rng = np.random.default_rng(0)
+    x = rng.gamma(2.0, 13.0, n).astype(np.float32)
+    return x + a_r * np.sin(b_r * x)
+
+
+def check_normalised(n=200_000):
+    # Heavy tails stretch the grid well past the bulk of the data; the KDE
+    # must still integrate to one there.
+    z = np.random.default_rng(0).standard_t(1.5, n)
+    grid, density, _, _ = binned_kde(z)
+    integral = np.trapezoid(density, grid)
+    if not np.isclose(integral, 1.0, atol=1e-3):
+        raise AssertionError(f"KDE integrates to {integral:.4f} on heavy-tailed data.")
+    return integral
+
+
+def gaussian_like(x, lam, mu, scale):
+    return scale * np.exp(-lam * (x - mu) ** 2)
+
+
+def histogram_fit(z, bins=80):
+    # Same estimator as Assignment-3: 80-bin histogram + curve_fit.
+    density, edges = np.histogram(z, bins=bins, density=True)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    start = [1 / (2 * np.var(z)), np.mean(z), np.max(density)]
+    params, _ = curve_fit(gaussian_like, centers, density, p0=start, maxfev=5000)
+    return lambda x: gaussian_like(x, *params)
+
+
+def held_out_loglik(pdf, test):
+    return np.mean(np.log(np.maximum(pdf(test), 1e-300)))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def bench(z, with_gan=False):
+    rng = np.random.default_rng(1)
+    z = rng.permutation(z)
+    split = int(0.8 * len(z))
+    train, test = z[:split], z[split:]
+    grid = np.linspace(z.min(), z.max(), GRID_POINTS)
+
+    rows = []
+
+    (_, _, kde_pdf, kde_sample), t_fit = timed(binned_kde, train)
+    _, t_eval = timed(kde_pdf, grid)
+    _, t_sample = timed(kde_sample, len(test))
+    rows.append(["Binned KDE", t_fit, t_eval, t_sample, held_out_loglik(kde_pdf, test)])
+
+    hist_pdf, t_fit = timed(histogram_fit, train)
+    _, t_eval = timed(hist_pdf, grid)
+    rows.append(["Histogram fit", t_fit, t_eval, float("nan"), held_out_loglik(hist_pdf, test)])
+
+    if with_gan:
+        from main import noise_dim, train_gan
+
+        generator, t_fit = timed(train_gan, train, GAN_EPOCHS, 64, False)
+        noise = np.random.normal(0, 1, (len(test), noise_dim))
+        samples, t_sample = timed(lambda: generator.predict(noise, verbose=0).ravel())
+        # The GAN has no density of its own; score a KDE of its samples.
+        gan_pdf = binned_kde(samples)[2]
+        rows.append(["GAN", t_fit, float("nan"), t_sample, held_out_loglik(gan_pdf, test)])
+
+    return rows
+
+
+def main():
+    with_gan = "--gan" in sys.argv
+
+    datasets = []
+    if os.path.isfile(DATA_FILE):
+        from main import load_data
+        datasets.append(("dataset", load_data(DATA_FILE)))
+    for n in SYNTHETIC_SIZES:
+        datasets.append((f"synthetic n={n}", synthesize(n)))
+
+    print(f"KDE integral on heavy-tailed t(1.5) data: {check_normalised():.4f}")
+    print(f"Grid evaluation on {GRID_POINTS} points; times in seconds.\n")
+    for name, z in datasets:
+        print(name)
+        print(f"{'Method':<15}{'fit':>10}{'eval':>10}{'sample':>10}{'loglik':>10}")
+        for method, t_fit, t_eval, t_sample, ll in bench(z, with_gan):
+            print(f"{method:<15}{t_fit:>10.4f}{t_eval:>10.4f}{t_sample:>10.4f}{ll:>10.4f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
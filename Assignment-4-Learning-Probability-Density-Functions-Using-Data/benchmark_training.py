@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from main import build_models, make_dataset, make_train_fn, noise_dim
+
+
+BATCH_SIZES = [64, 256, 1024]
+STEPS_PER_CALL = [1, 10, 100]
+MEASURE_STEPS = 1000
+SAMPLE_SIZE = 100_000
+
+
+def legacy_steps_per_second(z, batch_size, steps=200):
+    # The original loop: predict() plus three train_on_batch() calls per step.
+    generator, discriminator = build_models()
+    discriminator.compile(optimizer=tf.keras.optimizers.Adam(0.0004), loss="binary_crossentropy")
+    discriminator.trainable = False
+    noise_input = tf.keras.Input(shape=(noise_dim,))
+    gan = tf.keras.Model(noise_input, discriminator(generator(noise_input)))
+    gan.compile(optimizer=tf.keras.optimizers.Adam(0.0004), loss="binary_crossentropy")
+
+    real_labels = np.ones((batch_size, 1))
+    fake_labels = np.zeros((batch_size, 1))
+
+    def step():
+        idx = np.random.randint(0, len(z), batch_size)
+        noise = np.random.normal(0, 1, (batch_size, noise_dim))
+        fake_samples = generator.predict(noise, verbose=0)
+        discriminator.trainable = True
+        discriminator.train_on_batch(z[idx].reshape(-1, 1), real_labels)
+        discriminator.train_on_batch(fake_samples, fake_labels)
+        discriminator.trainable = False
+        gan.train_on_batch(np.random.normal(0, 1, (batch_size, noise_dim)), real_labels)
+
+    for _ in range(10):
+        step()
+    start = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return steps / (time.perf_counter() - start)
+
+
+def compiled_steps_per_second(z, batch_size, steps_per_call, steps=MEASURE_STEPS):
+    generator, discriminator = build_models()
+    d_opt = tf.keras.optimizers.Adam(0.0004)
+    g_opt = tf.keras.optimizers.Adam(0.0004)
+    train_steps = make_train_fn(generator, discriminator, d_opt, g_opt, batch_size)
+    iterator = iter(make_dataset(z, batch_size))
+    calls = max(1, steps // steps_per_call)
+    chunk = tf.constant(steps_per_call)
+
+    # First call traces the graph; keep it out of the timing.
+    train_steps(iterator, chunk)
+    start = time.perf_counter()
+    for _ in range(calls):
+        d_loss, _ = train_steps(iterator, chunk)
+    d_loss.numpy()
+    return calls * steps_per_call / (time.perf_counter() - start)
+
+
+def main():
+    z = np.random.default_rng(0).gamma(2.0, 13.0, SAMPLE_SIZE).astype(np.float32)
+
+    print(f"{'batch':>6}{'mode':>22}{'steps/s':>12}")
+    for batch_size in BATCH_SIZES:
+        rate = legacy_steps_per_second(z, batch_size)
+        print(f"{batch_size:>6}{'train_on_batch':>22}{rate:>12.1f}")
+        for steps_per_call in STEPS_PER_CALL:
+            rate = compiled_steps_per_second(z, batch_size, steps_per_call)
+            print(f"{batch_size:>6}{f'tf.function x{steps_per_call}':>22}{rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
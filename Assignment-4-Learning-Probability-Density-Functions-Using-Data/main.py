@@ -2,91 +2,182 @@ import numpy as np
 import pandas as pd
 import tensorflow as tf
 import matplotlib.pyplot as plt
-from tensorflow.keras.models import Sequential, Model
+from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, Input
-import os
 
 r = 102303748
 data_file = "india-air-quality-data.csv"
 noise_dim = 10
 epochs = 3000
 batch_size = 64
+steps_per_call = 100
+checkpoint_dir = "checkpoints"
+weights_file = "generator_weights.npz"
 
 a_r = 0.5 * (r % 7)
 b_r = 0.3 * ((r % 5) + 1)
 
-print("a_r =", a_r)
-print("b_r =", b_r)
 
-df = pd.read_csv(data_file, encoding="latin1")
-x = pd.to_numeric(df["no2"], errors="coerce").dropna().values.astype(np.float32)
-
-z = x + a_r * np.sin(b_r * x)
-
-generator = Sequential([
-    Dense(64, activation="relu", input_shape=(noise_dim,)),
-    Dense(64, activation="relu"),
-    Dense(1)
-])
-
-discriminator = Sequential([
-    Dense(64, activation="relu", input_shape=(1,)),
-    Dense(64, activation="relu"),
-    Dense(1, activation="sigmoid")
-])
-
-discriminator.compile(
-    optimizer=tf.keras.optimizers.Adam(0.0004),
-    loss="binary_crossentropy"
-)
-
-discriminator.trainable = False
-noise_input = Input(shape=(noise_dim,))
-fake = generator(noise_input)
-validity = discriminator(fake)
-
-gan = Model(noise_input, validity)
-gan.compile(
-    optimizer=tf.keras.optimizers.Adam(0.0004),
-    loss="binary_crossentropy"
-)
-
-real_labels = np.ones((batch_size, 1))
-fake_labels = np.zeros((batch_size, 1))
-
-for epoch in range(epochs):
-
-    idx = np.random.randint(0, len(z), batch_size)
-    real_samples = z[idx].reshape(-1, 1)
-
-    noise = np.random.normal(0, 1, (batch_size, noise_dim))
-    fake_samples = generator.predict(noise, verbose=0)
-
-    discriminator.trainable = True
-    discriminator.train_on_batch(real_samples, real_labels)
-    discriminator.train_on_batch(fake_samples, fake_labels)
-
-    noise = np.random.normal(0, 1, (batch_size, noise_dim))
-    discriminator.trainable = False
-    gan.train_on_batch(noise, real_labels)
-
-    if epoch % 300 == 0:
-        print("Epoch", epoch)
-
-noise = np.random.normal(0, 1, (6000, noise_dim))
-z_fake = generator.predict(noise).flatten()
-
-print("\nStatistics")
-print("Real mean:", np.mean(z))
-print("Generated mean:", np.mean(z_fake))
-print("Real std:", np.std(z))
-print("Generated std:", np.std(z_fake))
-
-plt.figure(figsize=(8,5))
-plt.hist(z_fake, bins=70, density=True)
-plt.xlabel("z")
-plt.ylabel("Density")
-plt.title("PDF from GAN Samples")
-
-plt.savefig("gan_pdf.png", dpi=300)
-plt.show()
+def load_data(path=data_file):
+    df = pd.read_csv(path, encoding="latin1")
+    x = pd.to_numeric(df["no2"], errors="coerce").dropna().values.astype(np.float32)
+    return x + a_r * np.sin(b_r * x)
+
+
+def build_models():
+    generator = Sequential([
+        Input(shape=(noise_dim,)),
+        Dense(64, activation="relu"),
+        Dense(64, activation="relu"),
+        Dense(1)
+    ])
+
+    discriminator = Sequential([
+        Input(shape=(1,)),
+        Dense(64, activation="relu"),
+        Dense(64, activation="relu"),
+        Dense(1, activation="sigmoid")
+    ])
+    return generator, discriminator
+
+
+def make_dataset(z, batch_size=batch_size):
+    # Real batches are shuffled, batched and prefetched by tf.data so the
+    # training loop never waits on host-side sampling.
+    return (
+        tf.data.Dataset.from_tensor_slices(z.reshape(-1, 1).astype(np.float32))
+        .shuffle(min(len(z), 100_000), reshuffle_each_iteration=True)
+        .repeat()
+        .batch(batch_size, drop_remainder=True)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+
+def make_train_fn(generator, discriminator, d_opt, g_opt, batch_size=batch_size):
+    bce = tf.keras.losses.BinaryCrossentropy()
+
+    real_labels = tf.ones((batch_size, 1))
+    fake_labels = tf.zeros((batch_size, 1))
+
+    def discriminator_step(samples, labels):
+        with tf.GradientTape() as tape:
+            loss = bce(labels, discriminator(samples, training=True))
+        grads = tape.gradient(loss, discriminator.trainable_variables)
+        d_opt.apply_gradients(zip(grads, discriminator.trainable_variables))
+        return loss
+
+    def train_step(real_samples):
+        # Two discriminator updates (real, then fake) and one generator
+        # update, as in the original train_on_batch loop.
+        noise = tf.random.normal((batch_size, noise_dim))
+        fake_samples = generator(noise, training=False)
+        d_loss = discriminator_step(real_samples, real_labels)
+        d_loss += discriminator_step(fake_samples, fake_labels)
+
+        noise = tf.random.normal((batch_size, noise_dim))
+        with tf.GradientTape() as tape:
+            validity = discriminator(generator(noise, training=True), training=False)
+            g_loss = bce(real_labels, validity)
+        grads = tape.gradient(g_loss, generator.trainable_variables)
+        g_opt.apply_gradients(zip(grads, generator.trainable_variables))
+        return d_loss, g_loss
+
+    # Runs several steps per Python call so per-call overhead is amortised.
+    @tf.function
+    def train_steps(iterator, steps):
+        d_loss = g_loss = tf.constant(0.0)
+        for _ in tf.range(steps):
+            d_loss, g_loss = train_step(next(iterator))
+        return d_loss, g_loss
+
+    return train_steps
+
+
+def train_gan(
+    z,
+    epochs=epochs,
+    batch_size=batch_size,
+    verbose=True,
+    steps_per_call=steps_per_call,
+    checkpoint_dir=None
+):
+    generator, discriminator = build_models()
+    d_opt = tf.keras.optimizers.Adam(0.0004)
+    g_opt = tf.keras.optimizers.Adam(0.0004)
+    train_steps = make_train_fn(generator, discriminator, d_opt, g_opt, batch_size)
+    iterator = iter(make_dataset(z, batch_size))
+
+    # With a checkpoint directory, training resumes from the latest saved
+    # step and saves again every 300 epochs.
+    step = tf.Variable(0, dtype=tf.int64)
+    manager = None
+    if checkpoint_dir:
+        checkpoint = tf.train.Checkpoint(
+            step=step,
+            generator=generator,
+            discriminator=discriminator,
+            d_opt=d_opt,
+            g_opt=g_opt
+        )
+        manager = tf.train.CheckpointManager(checkpoint, checkpoint_dir, max_to_keep=3)
+        if manager.latest_checkpoint:
+            checkpoint.restore(manager.latest_checkpoint)
+            if verbose:
+                print("Resumed from epoch", int(step.numpy()))
+
+    epoch = int(step.numpy())
+    while epoch < epochs:
+        if verbose and epoch % 300 == 0:
+            print("Epoch", epoch)
+
+        # Calls stop on multiples of 300 so progress is reported as before.
+        steps = min(steps_per_call, epochs - epoch, 300 - epoch % 300)
+        train_steps(iterator, tf.constant(steps))
+        epoch += steps
+        step.assign(epoch)
+
+        if manager and (epoch % 300 == 0 or epoch == epochs):
+            manager.save(checkpoint_number=epoch)
+
+    return generator
+
+
+def export_generator(generator, path=weights_file):
+    # Kernels and biases of the three Dense layers, for sampler.py.
+    arrays = {}
+    for i, layer in enumerate(generator.layers):
+        kernel, bias = layer.get_weights()
+        arrays[f"kernel_{i}"] = kernel.astype(np.float32)
+        arrays[f"bias_{i}"] = bias.astype(np.float32)
+    np.savez(path, **arrays)
+
+
+def main():
+    print("a_r =", a_r)
+    print("b_r =", b_r)
+
+    z = load_data()
+    generator = train_gan(z, checkpoint_dir=checkpoint_dir)
+    export_generator(generator)
+
+    noise = np.random.normal(0, 1, (6000, noise_dim))
+    z_fake = generator.predict(noise).flatten()
+
+    print("\nStatistics")
+    print("Real mean:", np.mean(z))
+    print("Generated mean:", np.mean(z_fake))
+    print("Real std:", np.std(z))
+    print("Generated std:", np.std(z_fake))
+
+    plt.figure(figsize=(8,5))
+    plt.hist(z_fake, bins=70, density=True)
+    plt.xlabel("z")
+    plt.ylabel("Density")
+    plt.title("PDF from GAN Samples")
+
+    plt.savefig("gan_pdf.png", dpi=300)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
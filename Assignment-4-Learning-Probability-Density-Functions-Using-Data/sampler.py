@@ -0,0 +1,48 @@
+import numpy as np
+
+
+WEIGHTS_FILE = "generator_weights.npz"
+BATCH_SIZE = 262_144
+
+
+def load_generator(path=WEIGHTS_FILE):
+    with np.load(path) as data:
+        n_layers = len([k for k in data.files if k.startswith("kernel_")])
+        return [(data[f"kernel_{i}"], data[f"bias_{i}"]) for i in range(n_layers)]
+
+
+def generate(layers, noise):
+    # Dense -> ReLU for every layer but the last, which is linear.
+    h = noise.astype(np.float32, copy=False)
+    for i, (kernel, bias) in enumerate(layers):
+        h = h @ kernel + bias
+        if i < len(layers) - 1:
+            np.maximum(h, 0, out=h)
+    return h
+
+
+def sample(layers, n, batch_size=BATCH_SIZE, rng=None):
+    rng = np.random.default_rng(rng)
+    noise_dim = layers[0][0].shape[0]
+    out = np.empty(n, dtype=np.float32)
+
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        noise = rng.standard_normal((stop - start, noise_dim), dtype=np.float32)
+        out[start:stop] = generate(layers, noise)[:, 0]
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    layers = load_generator()
+    loaded = time.perf_counter()
+    z_fake = sample(layers, 10_000_000)
+    done = time.perf_counter()
+
+    print(f"Loaded weights in {1000 * (loaded - start):.2f} ms")
+    print(f"Sampled {len(z_fake)} values in {done - loaded:.2f} s")
+    print("Generated mean:", np.mean(z_fake))
+    print("Generated std:", np.std(z_fake))
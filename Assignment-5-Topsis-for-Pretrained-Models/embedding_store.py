@@ -0,0 +1,85 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+CACHE_DIR = "embedding_cache"
+
+
+def text_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def model_dir(model_name, root=CACHE_DIR):
+    return os.path.join(root, model_name.replace("/", "__"))
+
+
+def load_index(path):
+    # Each encode call appends one shard: shard_<k>.npy holds the vectors and
+    # shard_<k>.keys the text hashes, one per row. The keys file is written
+    # last, so a shard without one is an interrupted write and is ignored.
+    index = {}
+    shards = []
+    if not os.path.isdir(path):
+        return index, shards
+
+    names = sorted(f for f in os.listdir(path) if f.endswith(".keys"))
+    for name in names:
+        stem = name[:-len(".keys")]
+        with open(os.path.join(path, name)) as f:
+            keys = f.read().split()
+        array = np.load(os.path.join(path, stem + ".npy"), mmap_mode="r")
+        for row, key in enumerate(keys):
+            index[key] = (len(shards), row)
+        shards.append(array)
+    return index, shards
+
+
+def write_shard(path, shard_id, keys, embeddings):
+    os.makedirs(path, exist_ok=True)
+    stem = os.path.join(path, f"shard_{shard_id:05d}")
+    np.save(stem + ".npy", embeddings)
+    with open(stem + ".keys", "w") as f:
+        f.write("\n".join(keys))
+
+
+def encode_cached(model_name, texts, model=None, root=CACHE_DIR, batch_size=64):
+    # Returns embeddings for `texts`, encoding only unique texts not already
+    # stored for this model. The model is loaded only if something is missing.
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    keys = [text_key(t) for t in texts]
+    path = model_dir(model_name, root)
+    index, shards = load_index(path)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in index and key not in missing:
+            missing[key] = text
+
+    if missing:
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name, device="cpu")
+
+        new = model.encode(
+            list(missing.values()),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+        write_shard(path, len(shards), list(missing), new)
+
+        for row, key in enumerate(missing):
+            index[key] = (len(shards), row)
+        shards.append(new)
+
+    locations = np.array([index[k] for k in keys])
+    out = np.empty((len(texts), shards[0].shape[1]), dtype=np.float32)
+    for shard_id in np.unique(locations[:, 0]):
+        mask = locations[:, 0] == shard_id
+        out[mask] = shards[shard_id][locations[mask, 1]]
+    return out
@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+
+BATCH_SIZES = [1, 8, 32]
+THREAD_COUNTS = [1, 4]
+TRIALS = 5
+WARMUP_BATCHES = 3
+
+# Configuration every model is compared at in the decision matrix.
+CRITERION_BATCH_SIZE = 1
+CRITERION_THREADS = 1
+
+
+def set_threads(n):
+    # Thread control is best effort: stand-in encoders may not use torch.
+    try:
+        import torch
+    except ImportError:
+        return None
+    previous = torch.get_num_threads()
+    torch.set_num_threads(n)
+    return previous
+
+
+def model_encoder(model):
+    def encode(batch):
+        return model.encode(
+            batch,
+            batch_size=len(batch),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    return encode
+
+
+def stand_in_encoder(dim=384, seed=0):
+    # Offline replacement for a real model: hashes tokens into a random
+    # projection, so cost grows with batch size and text length.
+    table = np.random.default_rng(seed).standard_normal((4096, dim)).astype(np.float32)
+
+    def encode(batch):
+        out = np.zeros((len(batch), dim), dtype=np.float32)
+        for i, text in enumerate(batch):
+            ids = [hash(tok) % len(table) for tok in text.lower().split()]
+            if ids:
+                out[i] = np.tanh(table[ids] @ table[:dim].T).mean(axis=0)
+        return out
+    return encode
+
+
+def run_trial(encode, texts, batch_size):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        t0 = time.perf_counter()
+        encode(batch)
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - start, latencies
+
+
+def benchmark_encoder(
+    encode,
+    texts,
+    batch_sizes=BATCH_SIZES,
+    thread_counts=THREAD_COUNTS,
+    trials=TRIALS,
+    warmup=WARMUP_BATCHES
+):
+    # One row per (threads, batch_size). Latency is the wall time of one
+    # encode() call on a whole batch, taken from every batch of every trial.
+    # ms_per_text is the amortised cost (total time / texts) and throughput
+    # its inverse, both from the median trial.
+    texts = list(texts)
+    rows = []
+
+    for threads in thread_counts:
+        previous = set_threads(threads)
+        try:
+            for batch_size in batch_sizes:
+                for _ in range(warmup):
+                    encode(texts[:batch_size])
+
+                elapsed, latencies = [], []
+                for _ in range(trials):
+                    total, lat = run_trial(encode, texts, batch_size)
+                    elapsed.append(total)
+                    latencies.extend(lat)
+
+                lat_ms = 1000 * np.array(latencies)
+                rows.append({
+                    "threads": threads,
+                    "batch_size": batch_size,
+                    "throughput_per_s": len(texts) / np.median(elapsed),
+                    "ms_per_text": 1000 * np.median(elapsed) / len(texts),
+                    "mean_ms": lat_ms.mean(),
+                    "p50_ms": np.percentile(lat_ms, 50),
+                    "p95_ms": np.percentile(lat_ms, 95),
+                    "p99_ms": np.percentile(lat_ms, 99),
+                })
+        finally:
+            if previous is not None:
+                set_threads(previous)
+
+    return pd.DataFrame(rows)
+
+
+def time_criterion(
+    results,
+    statistic="p50_ms",
+    batch_size=CRITERION_BATCH_SIZE,
+    threads=CRITERION_THREADS
+):
+    # Picks one number for the TOPSIS decision matrix, always from the same
+    # (batch_size, threads) configuration so every model is compared alike.
+    rows = results[(results["batch_size"] == batch_size) & (results["threads"] == threads)]
+    if rows.empty:
+        raise ValueError(
+            f"No benchmark row for batch_size={batch_size}, threads={threads}."
+        )
+
+    if statistic == "throughput_per_s":
+        # Cost criterion: convert to milliseconds per text.
+        return 1000 / rows[statistic].iloc[0]
+    return rows[statistic].iloc[0]
+
+
+if __name__ == "__main__":
+    import sys
+
+    texts = [f"sentence number {i} about a small cat sitting on a mat" for i in range(256)]
+
+    if len(sys.argv) > 1:
+        # A model name or path already in the local cache; never downloads.
+        from sentence_transformers import SentenceTransformer
+        encode = model_encoder(
+            SentenceTransformer(sys.argv[1], device="cpu", local_files_only=True)
+        )
+    else:
+        encode = stand_in_encoder()
+
+    table = benchmark_encoder(encode, texts)
+    print(table.to_string(index=False))
+    print(
+        f"\nTime_ms (p50 latency, batch_size={CRITERION_BATCH_SIZE}, "
+        f"threads={CRITERION_THREADS}):",
+        time_criterion(table)
+    )
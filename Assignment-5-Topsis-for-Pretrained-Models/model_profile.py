@@ -0,0 +1,77 @@
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def build_cache_index():
+    # One scan of the Hugging Face cache, reused for every model.
+    from huggingface_hub import scan_cache_dir
+
+    try:
+        cache_info = scan_cache_dir()
+    except Exception:
+        return {}
+    return {repo.repo_id: repo.size_on_disk / (1024 * 1024) for repo in cache_info.repos}
+
+
+def peak_rss_mb():
+    # The resource module does not exist on Windows; the RSS columns are
+    # left empty there.
+    if sys.platform == "win32":
+        return None
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def rss_growth(after, before):
+    return None if after is None else after - before
+
+
+def profile_in_process(model_name, texts, batch_size=32):
+    # Runs inside a fresh worker, so the RSS peak belongs to this model only.
+    from sentence_transformers import SentenceTransformer
+
+    base_mb = peak_rss_mb()
+    model = SentenceTransformer(model_name, device="cpu")
+    loaded_mb = peak_rss_mb()
+
+    params = sum(p.numel() for p in model.parameters())
+    weight_bytes = sum(
+        t.numel() * t.element_size()
+        for t in list(model.parameters()) + list(model.buffers())
+    )
+
+    model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+    peak_mb = peak_rss_mb()
+
+    # Peak_RSS_MB is the worker's absolute peak, torch included. The other
+    # two are increases over the peak right after the imports.
+    return {
+        "Params_M": params / 1e6,
+        "Weights_MB": weight_bytes / (1024 * 1024),
+        "Load_RSS_MB": rss_growth(loaded_mb, base_mb),
+        "Model_RSS_MB": rss_growth(peak_mb, base_mb),
+        "Peak_RSS_MB": peak_mb,
+    }
+
+
+def profile_models(model_names, texts, cache_index=None, batch_size=32):
+    # Each model gets its own spawned process; the numbers do not bleed
+    # between models and the notebook process stays small.
+    if cache_index is None:
+        cache_index = build_cache_index()
+
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for model_name in model_names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            stats = pool.submit(profile_in_process, model_name, list(texts), batch_size).result()
+        stats["Disk_MB"] = cache_index.get(model_name)
+        rows.append({"Model": model_name, **stats})
+
+    return pd.DataFrame(rows)
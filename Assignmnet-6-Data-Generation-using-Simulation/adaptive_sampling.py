@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+
+from sumo_runner import run_parallel
+
+
+FLOW_RANGE = (600, 1800)
+INITIAL_RUNS = 50
+BATCH_RUNS = 25
+VALIDATION_RUNS = 100
+MAX_RUNS = 1000
+CANDIDATES = 1000
+PATIENCE = 4
+R2_TOLERANCE = 0.005
+
+
+def fit_surrogate(flows, times, seed=0):
+    model = RandomForestRegressor(n_estimators=200, min_samples_leaf=5, random_state=seed)
+    model.fit(np.asarray(flows).reshape(-1, 1), times)
+    return model
+
+
+def tree_spread(model, flows):
+    per_tree = np.stack([tree.predict(flows.reshape(-1, 1)) for tree in model.estimators_])
+    return per_tree.std(axis=0)
+
+
+def next_flows(model, n, flow_range=FLOW_RANGE, candidates=CANDIDATES, rng=None):
+    # Draw where the trees disagree most. Sampling in proportion to the
+    # variance, rather than taking the top n, keeps one batch from piling
+    # onto a single spot.
+    rng = np.random.default_rng(rng)
+    grid = rng.uniform(*flow_range, candidates)
+    weight = tree_spread(model, grid) ** 2 + 1e-12
+    return rng.choice(grid, size=n, replace=False, p=weight / weight.sum())
+
+
+def run_valid(run_batch, flows, first_seed):
+    # run_parallel() yields in completion order; sorting by seed makes the
+    # fitted surrogate, and so the whole design, reproducible.
+    seeds = range(first_seed, first_seed + len(flows))
+    results = [r for r in run_batch(flows, seeds) if r["avg_time"] is not None]
+    return sorted(results, key=lambda r: r["seed"])
+
+
+def adaptive_design(
+    run_batch=run_parallel,
+    flow_range=FLOW_RANGE,
+    initial_runs=INITIAL_RUNS,
+    batch_runs=BATCH_RUNS,
+    validation_runs=VALIDATION_RUNS,
+    max_runs=MAX_RUNS,
+    patience=PATIENCE,
+    tol=R2_TOLERANCE,
+    seed=42,
+    verbose=True
+):
+    # run_batch(flows, seeds) must yield result dicts like run_parallel().
+    # A small uniform validation set is simulated once; R² on it is the
+    # stopping signal. The design stops when that R² has not improved by
+    # more than `tol` for `patience` batches, or after max_runs simulations
+    # (validation runs included).
+    rng = np.random.default_rng(seed)
+    next_seed = seed * 100_000
+
+    validation = pd.DataFrame(run_valid(run_batch, rng.uniform(*flow_range, validation_runs), next_seed))
+    next_seed += validation_runs
+    runs = validation_runs
+
+    results = []
+    history = []
+    flows = rng.uniform(*flow_range, initial_runs)
+    best = -np.inf
+    stale = 0
+
+    while True:
+        results.extend(run_valid(run_batch, flows, next_seed))
+        next_seed += len(flows)
+        runs += len(flows)
+
+        done = pd.DataFrame(results)
+        model = fit_surrogate(done["flow"], done["avg_time"], seed)
+        r2 = r2_score(validation["avg_time"], model.predict(validation[["flow"]].to_numpy()))
+        history.append({"runs": runs, "train_runs": len(done), "val_r2": r2})
+        if verbose:
+            print(f"Runs: {runs:5d}  training: {len(done):5d}  validation R2: {r2:.4f}")
+
+        if r2 > best + tol:
+            best = r2
+            stale = 0
+        else:
+            stale += 1
+
+        if stale >= patience or runs >= max_runs:
+            break
+
+        flows = next_flows(model, min(batch_runs, max_runs - runs), flow_range, rng=rng)
+
+    return done, validation, pd.DataFrame(history)
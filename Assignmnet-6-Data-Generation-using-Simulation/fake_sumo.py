@@ -0,0 +1,72 @@
+"""
+Stand-in for the `sumo` executable, for running the pipeline without SUMO.
+
+It accepts the same command-line options that sumo_runner passes, reads the
+routes file and writes a synthetic tripinfo file. Vehicles enter the 1 km
+link no closer than a 2.7 s headway (about 1330 veh/h); time spent waiting
+to enter is reported as departDelay, as SUMO does. Travel time grows with
+the number of vehicles on the link, roughly matching
+sumo_simulation_dataset.csv, and the time lost to that congestion is
+reported as waitingTime.
+
+Usage: run_parallel(flows, sumo_cmd=[sys.executable, "fake_sumo.py"])
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+
+BASE_TIME = 80.0
+TIME_PER_VEHICLE = 0.28
+HEADWAY = 2.7
+NOISE = 0.3
+VERSION = "1.0"
+
+
+def option(args, name, default=None):
+    return args[args.index(name) + 1] if name in args else default
+
+
+def main(args):
+    if "--version" in args:
+        print(f"fake_sumo {VERSION}")
+        return
+
+    routes = option(args, "-r")
+    tripinfo = option(args, "--tripinfo-output")
+    seed = int(option(args, "--seed", 0))
+    rng = np.random.default_rng(seed)
+
+    departs = np.array([
+        float(v.attrib["depart"])
+        for v in ET.parse(routes).getroot().iter("vehicle")
+    ])
+
+    # Queue discharge: each vehicle enters no sooner than HEADWAY after the last.
+    entry = np.empty_like(departs)
+    last = -np.inf
+    for i, t in enumerate(departs):
+        last = max(t, last + HEADWAY)
+        entry[i] = last
+
+    # Vehicles that entered during the previous base travel time are still
+    # on the link and slow this one down.
+    on_link = np.arange(len(entry)) - np.searchsorted(entry, entry - BASE_TIME)
+    durations = BASE_TIME + TIME_PER_VEHICLE * on_link + rng.normal(0, NOISE, len(entry))
+    waiting = np.maximum(durations - BASE_TIME, 0.0)
+
+    with open(tripinfo, "w") as f:
+        f.write("<tripinfos>\n")
+        for i, (depart, duration, wait) in enumerate(zip(entry, durations, waiting)):
+            f.write(
+                f'    <tripinfo id="veh{i}" depart="{depart:.2f}" '
+                f'departDelay="{depart - departs[i]:.2f}" '
+                f'duration="{duration:.2f}" waitingTime="{wait:.2f}"/>\n'
+            )
+        f.write("</tripinfos>\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import subprocess
+from functools import lru_cache
+
+import pandas as pd
+
+from sumo_runner import NETWORK_FILE, SIM_DURATION, SIM_END, SUMO_CMD, run_parallel
+
+
+CACHE_FILE = "sim_cache.jsonl"
+DATASET_FILE = "sumo_simulation_dataset.csv"
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def simulator_version(sumo_cmd):
+    try:
+        out = subprocess.run(
+            list(sumo_cmd) + ["--version"],
+            capture_output=True,
+            text=True,
+            timeout=60
+        ).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return out.strip().splitlines()[0] if out.strip() else "unknown"
+
+
+def run_key(network_digest, flow, seed, version):
+    # Everything that determines a run's outcome goes into the key.
+    payload = json.dumps({
+        "network": network_digest,
+        "flow": float(flow),
+        "seed": int(seed),
+        "sim_duration": SIM_DURATION,
+        "sim_end": SIM_END,
+        "simulator": version,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache(path=CACHE_FILE):
+    cache = {}
+    if not os.path.isfile(path):
+        return cache
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                cache[entry["key"]] = entry
+    return cache
+
+
+def to_plain(value):
+    # NumPy scalars are not JSON serializable.
+    return value.item() if hasattr(value, "item") else value
+
+
+def cached_run_parallel(
+    flows,
+    seeds=None,
+    network=NETWORK_FILE,
+    sumo_cmd=SUMO_CMD,
+    workers=None,
+    cache_file=CACHE_FILE
+):
+    # Drop-in for run_parallel(): cached outcomes are yielded first, only
+    # missing points are simulated, and every new outcome (failed runs
+    # included) is appended to the cache as it completes.
+    flows = list(flows)
+    seeds = list(range(len(flows)) if seeds is None else seeds)
+    network_digest = file_digest(network)
+    version = simulator_version(tuple(sumo_cmd))
+    cache = load_cache(cache_file)
+
+    missing_flows, missing_seeds = [], []
+    for flow, seed in zip(flows, seeds):
+        entry = cache.get(run_key(network_digest, flow, seed, version))
+        if entry is not None:
+            yield entry["result"]
+        else:
+            missing_flows.append(flow)
+            missing_seeds.append(seed)
+
+    if not missing_flows:
+        return
+
+    with open(cache_file, "a") as f:
+        for result in run_parallel(missing_flows, missing_seeds, network, sumo_cmd, workers):
+            result = {k: to_plain(v) for k, v in result.items()}
+            entry = {
+                "key": run_key(network_digest, result["flow"], result["seed"], version),
+                "network": network_digest,
+                "simulator": version,
+                "result": result,
+            }
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            yield result
+
+
+def export_dataset(
+    runs=None,
+    cache_file=CACHE_FILE,
+    path=DATASET_FILE,
+    network=NETWORK_FILE,
+    sumo_cmd=SUMO_CMD
+):
+    # Writes valid cached runs in the notebook's dataset format: the given
+    # (flow, seed) pairs in order, or every run cached for the current
+    # network and simulator when runs is None.
+    network_digest = file_digest(network)
+    version = simulator_version(tuple(sumo_cmd))
+    cache = load_cache(cache_file)
+
+    if runs is None:
+        entries = [
+            entry for entry in cache.values()
+            if entry["network"] == network_digest and entry["simulator"] == version
+        ]
+    else:
+        keys = [run_key(network_digest, flow, seed, version) for flow, seed in runs]
+        entries = [cache[key] for key in keys if key in cache]
+
+    rows = [entry["result"] for entry in entries if entry["result"]["avg_time"] is not None]
+
+    df = pd.DataFrame(rows, columns=["flow", "vehicle_count", "avg_time"]).rename(columns={
+        "flow": "traffic_flow_veh_per_hour",
+        "avg_time": "avg_travel_time",
+    })
+    df.to_csv(path, index=False)
+    return df